@@ -1,28 +1,46 @@
 # janus_scheduler/engine/components.py
 
+import enum
+import math
 import random
 
+# --- Component Types ---
+
+class TaskType(enum.IntEnum):
+    CPU_BOUND = 0
+    IO_BOUND = 1
+
+class CoreType(enum.IntEnum):
+    P = 0
+    E = 1
+
+# Display names, for status output
+TASK_TYPE_NAMES = {TaskType.CPU_BOUND: "CPU-Bound", TaskType.IO_BOUND: "I/O-Bound"}
+CORE_TYPE_NAMES = {CoreType.P: "P-core", CoreType.E: "E-core"}
+
+# Temperatures and power draws are kept in integer tenths (of a °C / of a power unit),
+# so multi-tick updates in CPUCore.advance() are exact and match stepping tick by tick
+AMBIENT_TEMP = 250 # 25.0°C
+
 # --- Enhanced Component Classes ---
 
 class Task:
     """Represents a more realistic task with detailed properties."""
-    def __init__(self, task_id, arrival_time):
+    __slots__ = ("id", "arrival_time", "type", "total_cycles", "io_frequency",
+                 "cycles_done", "io_wait_timer", "next_io_in", "rng")
+
+    def __init__(self, task_id, arrival_time, task_type, total_cycles, io_frequency, rng=random):
         self.id = task_id
         self.arrival_time = arrival_time # The simulation tick when this task appears
-        
-        # Determine if a task is CPU-bound or I/O-bound
-        is_cpu_bound = random.random() > 0.5
-        if is_cpu_bound:
-            self.type = "CPU-Bound"
-            self.total_cycles = random.randint(200, 500) # Needs a lot of computation
-            self.io_frequency = 0 # Rarely waits for I/O
-        else:
-            self.type = "I/O-Bound"
-            self.total_cycles = random.randint(50, 100) # Less computation
-            self.io_frequency = random.randint(3, 8) # Pauses for I/O often
+        self.type = task_type # A TaskType
+        self.total_cycles = total_cycles
+        self.io_frequency = io_frequency # Chance (in %) of pausing for I/O on each tick of work
+        self.rng = rng # Source of I/O events; normally the owning SoC's random.Random
 
         self.cycles_done = 0
         self.io_wait_timer = 0 # How long the task has to wait for I/O
+        # Ticks of work left before the next I/O event
+        self.next_io_in = self.sample_io_gap() if self.type == TaskType.IO_BOUND else math.inf
 
     def is_finished(self):
         return self.cycles_done >= self.total_cycles
@@ -30,94 +48,185 @@ class Task:
     def is_waiting_for_io(self):
         return self.io_wait_timer > 0
 
-    def work(self, cycles_to_do):
-        """Perform work on the task and handle I/O events."""
+    def sample_io_gap(self):
+        """Draws how many ticks of work happen until the next I/O event.
+
+        The gap is geometric, matching a randint(1, 100) < io_frequency roll
+        on every tick of work, but costs one draw per event instead of one per tick.
+        """
+        p = (self.io_frequency - 1) / 100
+        if p <= 0:
+            return math.inf # The roll can never succeed, so the task never pauses for I/O
+        return int(math.log(1.0 - self.rng.random()) / math.log(1.0 - p)) + 1
+
+    def work(self, cycles_to_do, ticks=1):
+        """Perform `ticks` ticks of work on the task and handle I/O events."""
         if self.is_waiting_for_io():
-            self.io_wait_timer -= 1
+            self.io_wait_timer -= ticks
             return
             
-        self.cycles_done += cycles_to_do
+        self.cycles_done += ticks * cycles_to_do
 
         # Check if an I/O event occurs
-        if self.type == "I/O-Bound" and random.randint(1, 100) < self.io_frequency:
-            self.io_wait_timer = random.randint(5, 10) # Set I/O wait time
+        self.next_io_in -= ticks
+        if self.next_io_in <= 0:
+            self.io_wait_timer = self.rng.randint(5, 10) # Set I/O wait time
+            self.next_io_in = self.sample_io_gap()
 
     def __repr__(self):
-        return f"Task-{self.id}({self.type}, {self.cycles_done}/{self.total_cycles})"
+        return f"Task-{self.id}({TASK_TYPE_NAMES[self.type]}, {self.cycles_done}/{self.total_cycles})"
 
 
 class CPUCore:
     """Represents a core with thermal properties."""
-    def __init__(self, core_id, core_type="E-core"):
+    __slots__ = ("id", "type", "current_task", "_is_active", "on_finish", "base_speed", "power_draw",
+                 "heat_generation", "idle_power_draw", "temperature", "max_temp", "cooling_factor",
+                 "temperature_step", "throttled", "current_speed")
+
+    def __init__(self, core_id, core_type=CoreType.E, on_finish=None):
         self.id = core_id
         self.type = core_type
         self.current_task = None
+        # A core is "active" if it has a task AND that task is not waiting for I/O.
+        # Cached, and only updated when the task is assigned, finishes or enters/leaves I/O wait
+        self._is_active = False
+        self.on_finish = on_finish # Called as on_finish(core, task) when a task completes
         
-        # Performance, Power, and Thermal properties
-        if self.type == "P-core":
+        # Performance, Power, and Thermal properties (power and temperatures in tenths)
+        if self.type == CoreType.P:
             self.base_speed = 2.0
-            self.power_draw = 4.0
-            self.heat_generation = 0.8 # Generates more heat
+            self.power_draw = 40 # 4.0 units
+            self.heat_generation = 8 # Generates more heat (0.8°C per tick)
         else:
             self.base_speed = 1.0
-            self.power_draw = 1.0
-            self.heat_generation = 0.2 # Generates less heat
-
-        self.idle_power_draw = 0.1
-        self.temperature = 25.0 # Starting temperature
-        self.max_temp = 90.0 # Throttling threshold
-        self.cooling_factor = 0.4 # How quickly it cools down
+            self.power_draw = 10 # 1.0 units
+            self.heat_generation = 2 # Generates less heat (0.2°C per tick)
+
+        self.idle_power_draw = 1 # 0.1 units
+        self.temperature = AMBIENT_TEMP # Starting temperature
+        self.max_temp = 900 # Throttling threshold (90.0°C)
+        self.cooling_factor = 4 # How quickly it cools down (0.4°C per tick)
+        # Per-tick temperature change, indexed by whether the core is actively computing
+        self.temperature_step = (-self.cooling_factor, self.heat_generation)
+        # Speed only changes when the temperature crosses max_temp, so it is cached
+        self.throttled = False
+        self.current_speed = self.base_speed
 
     def get_current_speed(self):
         """Returns the core's speed, adjusted for thermal throttling."""
-        if self.temperature >= self.max_temp:
+        return self.current_speed
+
+    def check_throttling(self):
+        """Refreshes the cached speed if the temperature crossed the throttling threshold."""
+        throttled = self.temperature >= self.max_temp
+        if throttled != self.throttled:
+            self.throttled = throttled
             # Drastically reduce speed if overheating
-            return self.base_speed * 0.5 
-        return self.base_speed
+            self.current_speed = self.base_speed * 0.5 if throttled else self.base_speed
 
     def get_current_power_draw(self):
-        """Returns the current power draw based on the core's state."""
-        # A core is considered "active" if it has a task AND that task is not waiting for I/O
-        is_active = self.current_task is not None and not self.current_task.is_waiting_for_io()
-        
-        if is_active:
+        """Returns the current power draw (in tenths) based on the core's state."""
+        if self._is_active:
             return self.power_draw
         else:
             return self.idle_power_draw
 
-    def update_temperature(self):
+    def power_change(self, was_active, is_active):
+        """Returns the change in power draw when the core goes from was_active to is_active."""
+        if was_active == is_active:
+            return 0
+        if is_active:
+            return self.power_draw - self.idle_power_draw
+        return self.idle_power_draw - self.power_draw
+
+    def update_temperature(self, is_active_computing):
         """Updates the core's temperature based on its state."""
-        # A core is active and generating heat only if its task is NOT waiting for I/O
-        is_active_computing = self.current_task is not None and not self.current_task.is_waiting_for_io()
-        
-        if is_active_computing:
-            self.temperature += self.heat_generation
-        else:
-            # Cool down if idle OR if the task is waiting for I/O
-            self.temperature -= self.cooling_factor
-        
-        # Ensure temperature doesn't drop below ambient
-        self.temperature = max(25.0, self.temperature)
+        # Heat up while computing, cool down if idle OR if the task is waiting for I/O,
+        # and ensure temperature doesn't drop below ambient
+        self.temperature = max(AMBIENT_TEMP, self.temperature + self.temperature_step[is_active_computing])
+        self.check_throttling()
 
     def assign_task(self, task):
         self.current_task = task
+        self._is_active = task is not None and not task.is_waiting_for_io()
 
     def tick(self):
-        """A single time step for the core."""
-        self.update_temperature()
-        if self.current_task:
-            if self.current_task.is_finished():
-                self.current_task = None
-                return
-            
-            if self.current_task.is_waiting_for_io():
-                # If task is waiting for I/O, the core is effectively idle
-                pass
-            else:
-                # Do work
-                speed = self.get_current_speed()
-                self.current_task.work(speed)
+        """A single time step for the core. Returns the change in its power draw."""
+        task = self.current_task
+        # A core is active and generating heat only if its task is NOT waiting for I/O
+        was_active = self._is_active
+        self.update_temperature(was_active)
+        if task is None:
+            return 0
+
+        # work() either burns down the task's I/O wait or advances it at the
+        # core's current (possibly throttled) speed
+        task.work(self.get_current_speed())
+        return self.finish_work(task, was_active)
+
+    def finish_work(self, task, was_active):
+        """Frees the core if its task just completed. Returns the change in power draw."""
+        if task.is_finished():
+            self.current_task = None
+            self._is_active = False
+            if self.on_finish is not None:
+                self.on_finish(self, task)
+        else:
+            self._is_active = task.io_wait_timer <= 0
+        return self.power_change(was_active, self._is_active)
+
+    def quiescent_ticks(self):
+        """Returns how many upcoming ticks this core will run without an event.
+
+        Over that many ticks the core neither fires an I/O event, crosses the
+        throttling threshold nor completes its task before the last tick, so
+        they can be applied in one step with advance().
+        """
+        task = self.current_task
+        if task is None:
+            return math.inf # An idle core only cools down
+        if task.io_wait_timer > 0:
+            return task.io_wait_timer
+
+        # Stop on the tick of the task's next I/O event
+        ticks = task.next_io_in
+
+        # Speed stays constant until the core heats up to its throttling threshold
+        if self.temperature + self.heat_generation < self.max_temp:
+            ticks = min(ticks, (self.max_temp - 1 - self.temperature) // self.heat_generation)
+
+        # Stop on the tick that completes the task
+        speed = self.base_speed
+        if self.temperature + self.heat_generation >= self.max_temp:
+            speed *= 0.5
+        return min(ticks, math.ceil((task.total_cycles - task.cycles_done) / speed))
+
+    def advance(self, ticks):
+        """Applies `ticks` quiescent ticks in a single step. Returns the change in power draw.
+
+        Only valid for ticks <= quiescent_ticks(); advance(1) is equivalent to tick().
+        """
+        task = self.current_task
+        if task is None:
+            self.temperature = max(AMBIENT_TEMP, self.temperature - ticks * self.cooling_factor)
+            self.check_throttling()
+            return 0
+
+        was_active = self._is_active
+        if was_active:
+            self.temperature += self.heat_generation
+            self.check_throttling()
+            task.work(self.get_current_speed(), ticks)
+            self.temperature += (ticks - 1) * self.heat_generation
+            self.check_throttling()
+        else:
+            self.temperature = max(AMBIENT_TEMP, self.temperature - ticks * self.cooling_factor)
+            self.check_throttling()
+            task.work(0, ticks)
+
+        # Only the last tick can complete the task or end or start an I/O wait
+        return self.finish_work(task, was_active)
 
     def __repr__(self):
         status = "Idle" if not self.current_task else f"Running {self.current_task}"
-        return f"Core-{self.id}({self.type}) Temp:{self.temperature:.1f}°C | {status}"
\ No newline at end of file
+        return f"Core-{self.id}({CORE_TYPE_NAMES[self.type]}) Temp:{self.temperature / 10:.1f}°C | {status}"
\ No newline at end of file
@@ -1,31 +1,78 @@
 # janus_scheduler/main.py
 
+import argparse
+import logging
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
 from engine.scheduler import SoC
 
-def main():
-    """Main function to run the simulation."""
-    print("--- Starting Janus Scheduler Simulation (Text-Based) ---")
-    
-    # Simulation Parameters
-    NUM_P_CORES = 2
-    NUM_E_CORES = 4
-    NUM_TASKS = 20
-    MAX_TICKS = 1000 # To prevent infinite loops
+# Simulation Parameters
+DEFAULT_CONFIG = {
+    "num_p_cores": 2,
+    "num_e_cores": 4,
+    "num_tasks": 20,
+    "max_ticks": 1000, # To prevent infinite loops
+    "seed": None,
+}
+
+def simulate(config, report=False):
+    """Runs one simulation and returns the finished SoC.
+
+    `config` overrides any of DEFAULT_CONFIG. With `report`, the status of
+    every core is printed every 10 ticks.
+    """
+    config = {**DEFAULT_CONFIG, **config}
+    num_tasks, max_ticks = config["num_tasks"], config["max_ticks"]
 
     # Create and run the SoC
-    soc = SoC(NUM_P_CORES, NUM_E_CORES, NUM_TASKS)
+    soc = SoC(config["num_p_cores"], config["num_e_cores"], num_tasks, seed=config["seed"])
     
     # Main simulation loop
-    while len(soc.completed_tasks) < NUM_TASKS and soc.current_tick < MAX_TICKS:
-        soc.run_simulation_tick()
-        # Optional: Print status every 10 ticks for readability
+    while soc.completed_count < num_tasks and soc.current_tick < max_ticks:
+        if not report:
+            soc.run_simulation_tick(max_ticks=max_ticks - soc.current_tick)
+            continue
+
+        # Fast-forward quiet stretches, stopping on every status report tick
+        next_report = (soc.current_tick // 10 + 1) * 10
+        soc.run_simulation_tick(max_ticks=min(next_report, max_ticks) - soc.current_tick)
+        # Print status every 10 ticks for readability
         if soc.current_tick % 10 == 0:
-            print("-----------------------------------------------------")
-            for core in soc.all_cores:
-                print(core)
-            print(f"Task Queue: {[f'Task-{t.id}' for t in soc.task_queue]}")
-            print("-----------------------------------------------------")
+            # Build the whole report first and write it in one go
+            separator = "-----------------------------------------------------"
+            lines = [separator, *(repr(core) for core in soc.cores),
+                     f"Task Queue: {[f'Task-{t.id}' for t in soc.task_queue]}", separator]
+            sys.stdout.write("\n".join(lines) + "\n")
 
+    return soc
+
+def run_once(config):
+    """Runs one simulation and returns its config merged with its final stats."""
+    return {**DEFAULT_CONFIG, **config, **simulate(config).final_stats()}
+
+def run_sweep(configs, workers=None):
+    """Runs one simulation per config across worker processes.
+
+    SoCs share no state and each seeds its own generator, so results are
+    reproducible for seeded configs. Returns run_once() results in config order.
+    """
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(run_once, configs))
+
+def main():
+    """Main function to run the simulation."""
+    parser = argparse.ArgumentParser(description="Janus Scheduler SoC simulation")
+    parser.add_argument("-v", "--verbose", action="store_true",
+                        help="log every task arrival, assignment and completion")
+    parser.add_argument("--seed", type=int, help="random seed, for reproducible runs")
+    args = parser.parse_args()
+    # Log to stdout so events stay in order with the status reports, as plain prints did
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING,
+                        format="%(message)s", stream=sys.stdout)
+
+    print("--- Starting Janus Scheduler Simulation (Text-Based) ---")
+    soc = simulate({"seed": args.seed}, report=True)
     soc.print_final_stats()
 
 if __name__ == "__main__":
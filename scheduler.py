@@ -1,109 +1,178 @@
 # janus_scheduler/engine/scheduler.py
 
+import heapq
+import logging
+import math
 import random
-from .components import Task, CPUCore # The '.' is important, it means import from the same package
+from collections import deque
+from itertools import chain
+from operator import attrgetter
+from .components import Task, CPUCore, TaskType, CoreType, TASK_TYPE_NAMES # The '.' is important, it means import from the same package
+
+log = logging.getLogger(__name__)
 
 class SoC:
     """The main System on a Chip class that manages all components and runs the simulation."""
-    def __init__(self, num_p_cores, num_e_cores, num_tasks):
-        # Create the CPU cores
-        self.p_cores = [CPUCore(core_id=i, core_type="P-core") for i in range(num_p_cores)]
-        self.e_cores = [CPUCore(core_id=i + num_p_cores, core_type="E-core") for i in range(num_e_cores)]
-        self.all_cores = self.p_cores + self.e_cores
+    def __init__(self, num_p_cores, num_e_cores, num_tasks, keep_history=False, seed=None):
+        # Private generator, so runs are reproducible from `seed` and independent of global state
+        self.rng = random.Random(seed)
+
+        # Create the CPU cores, P-cores first so a core is a P-core iff its id < num_p_cores
+        self.num_p_cores = num_p_cores
+        self.cores = [CPUCore(core_id=i, core_type=CoreType.P if i < num_p_cores else CoreType.E,
+                              on_finish=self.task_finished)
+                      for i in range(num_p_cores + num_e_cores)]
+        self.idle_cores = set(self.cores)
         
         # Prepare task lists
-        self.master_task_list = self.generate_tasks(num_tasks)
-        self.task_queue = [] # Tasks that have arrived but are not yet assigned
-        self.completed_tasks = []
+        self.arrivals = self.generate_tasks(num_tasks) # Heap of (arrival_time, id, task)
+        # Tasks that have arrived but are not yet assigned, bucketed by type
+        self.cpu_q = deque()
+        self.io_q = deque()
+        # Completion stats are kept as running totals; the tasks themselves only on request
+        self.completed_count = 0
+        self.completed_arrival_sum = 0
+        self.completed_tasks = [] if keep_history else None
+
+        # The topology is fixed, so resolve each core's (preferred, fallback) queue once:
+        # P-cores prefer CPU-Bound tasks, E-cores prefer I/O-Bound tasks
+        self.queue_order = [(self.cpu_q, self.io_q) if i < num_p_cores else (self.io_q, self.cpu_q)
+                            for i in range(len(self.cores))]
 
         # Simulation state
         self.current_tick = 0
-        self.total_power_consumed = 0.0
+        self._power_consumed = 0 # In tenths, like the cores' power draws
+        # Combined power draw of all cores, updated only when a core changes state
+        self._per_tick_power = sum(core.idle_power_draw for core in self.cores)
 
     def generate_tasks(self, num_tasks):
-        """Generates a list of tasks with varying arrival times."""
-        tasks = []
-        for i in range(num_tasks):
-            # Tasks will arrive at staggered times
-            arrival_time = random.randint(0, num_tasks * 5)
-            tasks.append(Task(task_id=i, arrival_time=arrival_time))
-        # Sort tasks by arrival time
-        tasks.sort(key=lambda x: x.arrival_time)
-        return tasks
+        """Generates a heap of tasks with varying arrival times, keyed on arrival time."""
+        # Draw each random property for every task in one bulk call
+        arrival_times = self.rng.choices(range(num_tasks * 5 + 1), k=num_tasks) # Staggered arrivals
+        task_types = self.rng.choices(tuple(TaskType), k=num_tasks)
+        cpu_cycles = self.rng.choices(range(200, 501), k=num_tasks) # Needs a lot of computation
+        io_cycles = self.rng.choices(range(50, 101), k=num_tasks) # Less computation
+        io_frequencies = self.rng.choices(range(3, 9), k=num_tasks) # Pauses for I/O often
+
+        arrivals = []
+        for i, arrival_time in enumerate(arrival_times):
+            if task_types[i] == TaskType.CPU_BOUND:
+                task = Task(i, arrival_time, TaskType.CPU_BOUND, cpu_cycles[i], io_frequency=0, rng=self.rng)
+            else:
+                task = Task(i, arrival_time, TaskType.IO_BOUND, io_cycles[i], io_frequencies[i], rng=self.rng)
+            # The id breaks ties, so tasks arriving together keep their creation order
+            arrivals.append((arrival_time, i, task))
+        heapq.heapify(arrivals)
+        return arrivals
+
+    @property
+    def task_queue(self):
+        """All waiting tasks, CPU-Bound first (read-only view for status output)."""
+        return list(chain(self.cpu_q, self.io_q))
 
     def check_for_new_arrivals(self):
         """Checks if any tasks have arrived at the current tick and adds them to the queue."""
-        while self.master_task_list and self.master_task_list[0].arrival_time <= self.current_tick:
-            task = self.master_task_list.pop(0)
-            print(f"Tick {self.current_tick}: ==> Task-{task.id} ({task.type}) has arrived.")
-            self.task_queue.append(task)
+        while self.arrivals and self.arrivals[0][0] <= self.current_tick:
+            _, _, task = heapq.heappop(self.arrivals)
+            log.info("Tick %d: ==> Task-%d (%s) has arrived.", self.current_tick, task.id, TASK_TYPE_NAMES[task.type])
+            if task.type == TaskType.CPU_BOUND:
+                self.cpu_q.append(task)
+            else:
+                self.io_q.append(task)
             
+    def task_finished(self, core, task):
+        """Records a task completed by a core and marks the core as idle."""
+        log.info("Tick %d: <== Task-%d has finished on Core-%d.", self.current_tick, task.id, core.id)
+        self.completed_count += 1
+        self.completed_arrival_sum += task.arrival_time
+        if self.completed_tasks is not None:
+            self.completed_tasks.append(task)
+        self.idle_cores.add(core)
+
     def schedule_rule_based(self):
         """A simple, rule-based scheduler to assign tasks from the queue."""
-        # Don't do anything if there are no tasks in the queue
-        if not self.task_queue:
+        cpu_q, io_q = self.cpu_q, self.io_q
+        # Don't do anything unless a core is idle and there are tasks in the queue
+        if not self.idle_cores or (not cpu_q and not io_q):
             return
 
-        # Try to assign tasks to idle cores
-        for core in self.all_cores:
-            if core.current_task and core.current_task.is_finished():
-                print(f"Tick {self.current_tick}: <== Task-{core.current_task.id} has finished on Core-{core.id}.")
-                self.completed_tasks.append(core.current_task)
-                core.current_task = None # Free up the core
-
-            if core.current_task is None and self.task_queue:
-                task_to_assign = None
-                
-                # --- SCHEDULER LOGIC ---
-                # Rule 1: Try to find the "best" task for the current core type
-                if core.type == "P-core":
-                    # P-cores prefer CPU-Bound tasks
-                    for task in self.task_queue:
-                        if task.type == "CPU-Bound":
-                            task_to_assign = task
-                            break
-                else: # E-core
-                    # E-cores prefer I/O-Bound tasks
-                    for task in self.task_queue:
-                        if task.type == "I/O-Bound":
-                            task_to_assign = task
-                            break
-                
-                # Rule 2: If no "best" task is found, just take any task to keep cores busy
-                if not task_to_assign and self.task_queue:
-                    task_to_assign = self.task_queue[0]
-                
-                # --- ASSIGNMENT ---
-                if task_to_assign:
-                    self.task_queue.remove(task_to_assign)
-                    core.assign_task(task_to_assign)
-                    print(f"Tick {self.current_tick}: --> Assigning Task-{task_to_assign.id} to Core-{core.id}.")
-
-
-    def run_simulation_tick(self):
-        """Executes a single step of the simulation."""
+        # Try to assign tasks to idle cores, in core order
+        for core in sorted(self.idle_cores, key=attrgetter("id")):
+            if not cpu_q and not io_q:
+                break
+
+            # --- SCHEDULER LOGIC ---
+            # Rule 1: Take a task from the core's preferred queue (see queue_order)
+            # Rule 2: If no "best" task is waiting, take any task to keep cores busy
+            primary, secondary = self.queue_order[core.id]
+            task_to_assign = primary.popleft() if primary else secondary.popleft()
+
+            # --- ASSIGNMENT ---
+            core.assign_task(task_to_assign)
+            self.idle_cores.discard(core)
+            self._per_tick_power += core.get_current_power_draw() - core.idle_power_draw
+            log.info("Tick %d: --> Assigning Task-%d to Core-%d.", self.current_tick, task_to_assign.id, core.id)
+
+
+    def run_simulation_tick(self, max_ticks=1):
+        """Executes a single step of the simulation.
+
+        With max_ticks > 1, a quiescent stretch (no arrivals, scheduling
+        decisions, I/O events, throttling changes or completions) of up to
+        max_ticks ticks is fast-forwarded in one step. Returns the number of
+        ticks advanced.
+        """
         # 1. Check for new tasks arriving
         self.check_for_new_arrivals()
 
         # 2. Run the scheduler to assign tasks
         self.schedule_rule_based()
         
-        # 3. Tick every core to process tasks and update temps
-        for core in self.all_cores:
-            core.tick()
-            self.total_power_consumed += core.get_current_power_draw()
+        # 3. Find how far the cores can run before anything interesting happens
+        ticks = 1
+        if max_ticks > 1:
+            next_arrival = self.arrivals[0][0] if self.arrivals else math.inf
+            ticks = min(max_ticks, next_arrival - self.current_tick,
+                        *(core.quiescent_ticks() for core in self.cores))
 
-        # 4. Increment simulation time
+        # 4. Tick every core to process tasks and update temps. Cores only change
+        # state on the last tick of a fast-forward, so the draw before it holds until then.
+        steady_power = power = self._per_tick_power
+        self.current_tick += ticks - 1 # Anything the cores report happens on the last tick
+        if ticks == 1:
+            for core in self.cores:
+                power += core.tick()
+        else:
+            for core in self.cores:
+                power += core.advance(ticks)
+        self._per_tick_power = power
+        self._power_consumed += (ticks - 1) * steady_power + power
+
+        # 5. Increment simulation time
         self.current_tick += 1
+        return ticks
+
+    @property
+    def total_power_consumed(self):
+        """Total energy used by all cores so far, in power units."""
+        return self._power_consumed / 10
+
+    def final_stats(self):
+        """Returns a summary of the simulation results as a dict."""
+        # Calculate average task completion time
+        avg_time = (self.current_tick - (self.completed_arrival_sum / self.completed_count)) if self.completed_count else 0
+        return {
+            "total_ticks": self.current_tick,
+            "tasks_completed": self.completed_count,
+            "total_power_consumed": self.total_power_consumed,
+            "avg_turnaround_time": avg_time,
+        }
 
     def print_final_stats(self):
         """Prints a summary of the simulation results."""
+        stats = self.final_stats()
         print("\n--- Simulation Finished ---")
-        print(f"Total Ticks: {self.current_tick}")
-        print(f"Total Tasks Completed: {len(self.completed_tasks)}")
-        print(f"Total Power Consumed: {self.total_power_consumed:.2f} units")
-        
-        # Calculate average task completion time
-        total_time = sum((task.arrival_time for task in self.completed_tasks))
-        avg_time = (self.current_tick - (total_time / len(self.completed_tasks))) if self.completed_tasks else 0
-        print(f"Average Task Turnaround Time: {avg_time:.2f} ticks")
\ No newline at end of file
+        print(f"Total Ticks: {stats['total_ticks']}")
+        print(f"Total Tasks Completed: {stats['tasks_completed']}")
+        print(f"Total Power Consumed: {stats['total_power_consumed']:.2f} units")
+        print(f"Average Task Turnaround Time: {stats['avg_turnaround_time']:.2f} ticks")
\ No newline at end of file
@@ -0,0 +1,37 @@
+# janus_scheduler/engine/test_fast_forward.py
+
+import unittest
+
+from engine.scheduler import SoC
+
+def run(seed, num_p_cores, num_e_cores, num_tasks, max_ticks, stride):
+    """Runs a simulation, stopping fast-forwards every `stride` ticks (None: never).
+
+    Returns the final stats plus each core's temperature and task progress.
+    """
+    soc = SoC(num_p_cores, num_e_cores, num_tasks, seed=seed)
+    while soc.completed_count < num_tasks and soc.current_tick < max_ticks:
+        limit = max_ticks if stride is None else min((soc.current_tick // stride + 1) * stride, max_ticks)
+        soc.run_simulation_tick(max_ticks=limit - soc.current_tick)
+    cores = [(core.temperature, core.current_task and core.current_task.cycles_done) for core in soc.cores]
+    return soc.final_stats(), cores
+
+class FastForwardTest(unittest.TestCase):
+    """Fast-forwarding must give exactly the same results as stepping one tick at a time."""
+
+    def assert_matches_stepping(self, seeds, *config):
+        for seed in seeds:
+            stepped = run(seed, *config, stride=1)
+            for stride in (10, None):
+                with self.subTest(seed=seed, stride=stride):
+                    self.assertEqual(run(seed, *config, stride=stride), stepped)
+
+    def test_default_config(self):
+        self.assert_matches_stepping(range(500), 2, 4, 20, 1000)
+
+    def test_large_config(self):
+        # Seed 407 used to throttle a core one tick early when fast-forwarded
+        self.assert_matches_stepping(range(400, 410), 4, 4, 200, 5000)
+
+if __name__ == "__main__":
+    unittest.main()
\ No newline at end of file